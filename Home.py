@@ -1,12 +1,18 @@
+import importlib.util
 import json
-from typing import Any, Dict, List
+import os
+import tempfile
+from typing import Any, Dict, List, Tuple
 
+import numpy as np
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 import streamlit as st
 
 from charts import plot_pie, render_world_map
 from filter_functions import select_and_filter_criteria, format_criterion_help
+from scoring import weighted_scores
 
 st.set_page_config(
     page_title="Location Tool", 
@@ -16,10 +22,17 @@ st.set_page_config(
 
 )
 
+# Influence chart colors per pillar id: (fallback label, color)
+PILLAR_COLORS = {
+    "environmental": ("Environmental", "#2a9d8f"),
+    "economic": ("Economic", "#e9c46a"),
+    "social": ("Social", "#e76f51"),
+}
+
 # ------------------------------
 # 1) Load and parse AHP hierarchy
 # ------------------------------
-#@st.cache_data(show_spinner=False)
+@st.cache_data(show_spinner=False)
 def load_hierarchy(json_path: str) -> Dict[str, Any]:
     """Load the hierarchy JSON file. """
     try:
@@ -31,112 +44,159 @@ def load_hierarchy(json_path: str) -> Dict[str, Any]:
         st.error(f"Hierarchy JSON parse error: {e}")
     return {"levels": []}
 
+
+@st.cache_data(show_spinner=False)
+def build_code_maps(json_path: str) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """Map each criterion code to its label and to its pillar's label."""
+    hierarchy = load_hierarchy(json_path)
+    code_to_label: Dict[str, str] = {}
+    code_to_pillar: Dict[str, str] = {}
+    for sub in hierarchy.get("top", {}).get("sublevels", []):
+        pillar_label = hierarchy.get(sub, {}).get("label", sub)
+        for crit in hierarchy.get(sub, {}).get("criteria", []):
+            code_to_label[crit["code"]] = crit["label"]
+            code_to_pillar[crit["code"]] = pillar_label
+    return code_to_label, code_to_pillar
+
 # ------------------------------
 # 2) Streamlit UI: Weight selection
 # ------------------------------
+def _normalize_group(raw: Dict[str, float]) -> Tuple[Dict[str, float], bool]:
+    """Normalize raw slider values to sum to 1.
+
+    Returns the normalized weights and whether all raw values were 0, in
+    which case equal weights are used.
+    """
+    values = np.fromiter(raw.values(), dtype=np.float64, count=len(raw))
+    total = values.sum()
+    all_zero = total == 0
+    normalized = np.full_like(values, 1.0 / len(values)) if all_zero else values / total
+    return dict(zip(raw, normalized.tolist())), bool(all_zero)
+
+
+def _renormalize_pillar(group: str, slider_keys: Dict[str, str]) -> None:
+    # Renormalize one slider group from its current slider values.
+    raw = {member: float(st.session_state.get(key, 0.0)) for member, key in slider_keys.items()}
+    st.session_state.setdefault("norm_weights", {})[group] = _normalize_group(raw)
+
+
+def _renormalize_all(groups: Dict[str, Dict[str, str]]) -> None:
+    # Form submit callback: apply the submitted slider values of every group.
+    for group, slider_keys in groups.items():
+        _renormalize_pillar(group, slider_keys)
+
+
+def _group_weights(group: str, slider_keys: Dict[str, str]) -> Tuple[Dict[str, float], bool]:
+    """Normalized weights of a slider group, as last applied via the form.
+
+    Computed directly on first use or when the group's members changed
+    (e.g. after a different criteria selection).
+    """
+    cached = st.session_state.get("norm_weights", {}).get(group)
+    if cached is None or cached[0].keys() != slider_keys.keys():
+        _renormalize_pillar(group, slider_keys)
+    return st.session_state["norm_weights"][group]
+
 
 def get_user_weights(hierarchy: Dict[str, Any], df: pd.DataFrame) -> Dict[str, Dict[str, float]]:
     """Collect user-chosen weights for top-level pillars and their criteria.
 
+    The sliders live in a form, so moving them does not rerun the app; all
+    changes are applied together with the "Apply weights" button. Until
+    then the previously applied weights are reused.
+
     Returns a nested dict:
       { pillar_id: {"weight": float, criterion_code: float, ... }, ... }
     All values are normalized to sum to 1 within their respective scopes.
     """
     weights: Dict[str, Dict[str, float]] = {}
-
-    st.header("Rating of the main categories")
-    st.write("Please assign weights to the main categories below. These weights determine the overall importance of each category in the final ranking.")
-    top_sublevels: List[str] = hierarchy["top"]["sublevels"]
-
-    # --- Main categories ---
-    equal_top = 1.0 / len(top_sublevels)
-    total_top = 0.0
-    for sub in top_sublevels:
-        default = float(equal_top)
-        w = st.slider(f"{hierarchy[sub]['label']}", 0.0, 1.0, default, 0.01) # Name from JSON Labels
-        weights[sub] = {"weight": float(w)}
-        total_top += float(w)
-
-    # Normalize and safeguard
-    if total_top == 0:
-        st.warning("All main category weights are 0. Setting equal weights.")
-        for sub in weights:
-            weights[sub]["weight"] = 1.0 / len(weights)
-    else:
-        for sub in weights:
-            weights[sub]["weight"] /= total_top
-
-    # --- Chart for main categories ---
-    pillar_df = pd.DataFrame(
-        {"Category": [hierarchy[sub]["label"] for sub in top_sublevels],
-         "Weight": [weights[sub]["weight"] for sub in top_sublevels]}
-    )
-
-    # Charts
-    plot_pie(pillar_df, "Category", "Weight", "Distribution of main categories")
-    # plot_horizontal_stacked(pillar_df, "Category", "Weight", "Distribution of main categories")
-
-    st.markdown("---")
-    st.header("Weights within each category")
-    st.write("Now, please assign weights to the individual indicators within each category. These weights determine the relative importance of each indicator within its category.")   
-
-    # --- Criteria within each category ---
-    for sub in top_sublevels:
-        st.subheader(hierarchy[sub]["label"])  # label from JSON; may be localized
-        # Filter criteria to those actually present in the data (exclude 'country_code')
-        all_criteria = hierarchy[sub].get("criteria", [])
-        available_codes = set(df.columns) - {"country_code"} if df is not None else set()
-        criteria = [c for c in all_criteria if c.get("code") in available_codes]
-
-        equal = 1.0 / len(criteria)
-        total_sub = 0.0
-        for crit in criteria:
-            code = crit["code"]
-            default = float(equal)
-            help_text = format_criterion_help(crit)
-
-            val = st.slider(
-                label=crit["label"],
-                min_value=0.0,
-                max_value=1.0,
-                value=default,
-                step=0.01,
-                key=f"w_{sub}_{code}",
-                help=help_text,
+    groups: Dict[str, Dict[str, str]] = {}  # slider keys per normalization group
+
+    with st.form("weights_form", border=False):
+        st.header("Rating of the main categories")
+        st.write("Please assign weights to the main categories below. These weights determine the overall importance of each category in the final ranking.")
+        top_sublevels: List[str] = hierarchy["top"]["sublevels"]
+
+        # --- Main categories ---
+        equal_top = 1.0 / len(top_sublevels)
+        top_keys = {sub: f"raw_w_top_{sub}" for sub in top_sublevels}
+        groups["top"] = top_keys
+        for sub in top_sublevels:
+            st.slider(
+                f"{hierarchy[sub]['label']}",  # Name from JSON Labels
+                0.0, 1.0, float(equal_top), 0.01,
+                key=top_keys[sub],
             )
 
-            weights[sub][code] = float(val)
-            total_sub += float(val)
+        # Normalized on submit; equal weights if all are 0
+        top_norm, top_all_zero = _group_weights("top", top_keys)
+        if top_all_zero:
+            st.warning("All main category weights are 0. Setting equal weights.")
+        for sub in top_sublevels:
+            weights[sub] = {"weight": top_norm[sub]}
+
+        # --- Chart for main categories ---
+        pillar_df = pd.DataFrame(
+            {"Category": [hierarchy[sub]["label"] for sub in top_sublevels],
+             "Weight": [weights[sub]["weight"] for sub in top_sublevels]}
+        )
 
-        # Normalize and safeguard
-        if total_sub == 0:
-            st.warning(f"All criteria under '{hierarchy[sub]['label']}' are 0. Setting equal weights.")
-            for crit in criteria:
-                weights[sub][crit["code"]] = 1.0 / len(criteria)
-        else:
+        # Charts
+        plot_pie(pillar_df, "Category", "Weight", "Distribution of main categories", key="pillar_pie")
+
+        st.markdown("---")
+        st.header("Weights within each category")
+        st.write("Now, please assign weights to the individual indicators within each category. These weights determine the relative importance of each indicator within its category.")   
+
+        # --- Criteria within each category ---
+        # Criteria actually present in the data (exclude 'country_code')
+        available_codes = frozenset(df.columns) - {"country_code"} if df is not None else frozenset()
+        for sub in top_sublevels:
+            st.subheader(hierarchy[sub]["label"])  # label from JSON; may be localized
+            all_criteria = hierarchy[sub].get("criteria", [])
+            criteria = [c for c in all_criteria if c.get("code") in available_codes]
+
+            equal = 1.0 / len(criteria)
+            crit_keys = {crit["code"]: f"raw_w_{sub}_{crit['code']}" for crit in criteria}
+            groups[sub] = crit_keys
             for crit in criteria:
-                weights[sub][crit["code"]] /= total_sub
+                st.slider(
+                    label=crit["label"],
+                    min_value=0.0,
+                    max_value=1.0,
+                    value=float(equal),
+                    step=0.01,
+                    key=crit_keys[crit["code"]],
+                    help=format_criterion_help(crit),
+                )
+
+            # Normalized on submit; equal weights if all are 0
+            crit_norm, crit_all_zero = _group_weights(sub, crit_keys)
+            if crit_all_zero:
+                st.warning(f"All criteria under '{hierarchy[sub]['label']}' are 0. Setting equal weights.")
+            weights[sub].update(crit_norm)
+
+            # Bar chart for criteria of this pillar (native chart, lighter than Plotly)
+            crit_df = pd.DataFrame(
+                {"Criterion": [c["label"] for c in criteria],
+                 "Weight": [weights[sub][c["code"]] for c in criteria]}
+            )
+            st.caption(f"Distribution within the category {hierarchy[sub]['label']}")
+            st.bar_chart(
+                crit_df,
+                x="Criterion",
+                y="Weight",
+                horizontal=True,
+                sort=False,
+                height=40 * len(crit_df) + 60,
+            )
+            st.markdown("---")
 
-        # Stacked bar chart for criteria of this pillar
-        crit_df = pd.DataFrame(
-            {"Criterion": [c["label"] for c in criteria],
-             "Weight": [weights[sub][c["code"]] for c in criteria]}
+        # Sliders inside the form do not rerun the app; the weights are only
+        # renormalized and applied once the form is submitted
+        st.form_submit_button(
+            "Apply weights", type="primary", on_click=_renormalize_all, args=(groups,)
         )
-        # plot_horizontal_stacked(
-        #     crit_df,
-        #     "Criterion",
-        #     "Weight",
-        #     f"Distribution within the category {hierarchy[sub]['label']}",
-        # )
-
-        # Pie chart for criteria of this pillar
-        plot_pie(
-            crit_df,
-            "Criterion",
-            "Weight",
-            f"Distribution within the category {hierarchy[sub]['label']}",
-            )
-        st.markdown("---")
 
     return weights
 
@@ -146,29 +206,77 @@ def get_user_weights(hierarchy: Dict[str, Any], df: pd.DataFrame) -> Dict[str, D
 # ------------------------------
 def compute_global_weights(weights: Dict[str, Dict[str, float]]) -> Dict[str, float]:
     """Multiply pillar weights by their criteria weights to obtain global weights."""
-    global_weights: Dict[str, float] = {}
-    for pillar, items in weights.items():
-        pillar_weight = items.get("weight", 0.0)
-        for key, value in items.items():
-            if key == "weight":
-                continue
-            global_weights[key] = pillar_weight * value
-    return global_weights
+    # Single flat comprehension; each pillar weight is looked up once
+    return {
+        key: pillar_weight * value
+        for items in weights.values()
+        for pillar_weight in (items.get("weight", 0.0),)
+        for key, value in items.items()
+        if key != "weight"
+    }
 
 
 # ------------------------------
 # 4) Compute country scores
 # ------------------------------
-#@st.cache_data(show_spinner=False)
+# Rust-based Excel reader, much faster than openpyxl when installed
+EXCEL_ENGINE = "calamine" if importlib.util.find_spec("python_calamine") else None
+
+
 def load_dataframe(path: str) -> pd.DataFrame:
-    """Load the country indicators from an Excel file.
+    """Load the country indicators from an Excel (or Parquet) file.
 
     Expected to contain a 'country_code' column and one column per criterion code.
+    Excel files get a Parquet copy next to them, which is read instead as
+    long as it is not older than the Excel file.
     """
-    return pd.read_excel(path)
+    if path.endswith(".parquet"):
+        return _read_indicators(path, os.path.getmtime(path))
 
+    parquet_path = os.path.splitext(path)[0] + ".parquet"
+    if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(path):
+        return _read_indicators(parquet_path, os.path.getmtime(parquet_path))
 
-#@st.cache_data(show_spinner=False)
+    df = _read_indicators(path, os.path.getmtime(path))
+    # Write to a temporary file and swap it in, so a session starting at the
+    # same moment never reads a half-written copy
+    try:
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=os.path.basename(parquet_path) + ".",
+            suffix=".tmp",
+            dir=os.path.dirname(parquet_path) or ".",
+        )
+    except OSError:
+        return df  # read-only location: keep using the Excel file
+    try:
+        with os.fdopen(fd, "wb") as f:
+            df.to_parquet(f, index=False)
+        os.replace(tmp_path, parquet_path)
+    except OSError:
+        pass  # could not write the copy: keep using the Excel file
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return df
+
+
+@st.cache_data(persist="disk", show_spinner=False)
+def _read_indicators(path: str, mtime: float) -> pd.DataFrame:
+    # mtime is only part of the cache key, so a rewritten file is read again.
+    if path.endswith(".parquet"):
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_excel(path, engine=EXCEL_ENGINE)
+
+    # float32 is plenty for normalized indicators and halves the memory;
+    # country codes are a small fixed set, so store them as a categorical
+    num_cols = df.select_dtypes("number").columns
+    df[num_cols] = df[num_cols].astype("float32")
+    df["country_code"] = df["country_code"].astype("category")
+    return df
+
+
+@st.cache_data(show_spinner=False)
 def load_countries_lookup(country_json_path: str) -> pd.DataFrame:
     """Load the country code --> name mapping from JSON into a DataFrame."""
     try:
@@ -182,7 +290,16 @@ def load_countries_lookup(country_json_path: str) -> pd.DataFrame:
         return pd.DataFrame(columns=["country_code", "country_name"])  # empty
 
     countries_df = pd.DataFrame(countries_data)
-    return countries_df.rename(columns={"code": "country_code", "name": "country_name"})
+    countries_df = countries_df.rename(columns={"code": "country_code", "name": "country_name"})
+    countries_df["country_code"] = countries_df["country_code"].astype("category")
+    return countries_df
+
+
+@st.cache_data(show_spinner=False)
+def load_country_names(country_json_path: str) -> Dict[str, str]:
+    """Country code --> name as a plain dict, for cheap per-run lookups."""
+    countries_df = load_countries_lookup(country_json_path)
+    return dict(zip(countries_df["country_code"], countries_df["country_name"]))
 
 
 def compute_country_scores(
@@ -204,32 +321,134 @@ def compute_country_scores(
         st.error("Input data is missing required column 'country_code'.")
         return pd.DataFrame(columns=["country_code", "country_name", "AHP_Score"])
 
-    # Compute scores; treat NaN as 0
-    results: List[Dict[str, Any]] = []
-    for _, row in df.iterrows():
-        total_score = 0.0
-        for crit, w in global_weights.items():
-            if crit in df.columns:
-                val = row[crit]
-                try:
-                    num = float(val) if pd.notna(val) else 0.0
-                except Exception:
-                    num = 0.0
-                total_score += num * float(w)
-            # else: missing column contributes 0
-        results.append({"country_code": row["country_code"], "AHP_Score": total_score})
-    results_df = pd.DataFrame(results)
-
-    # Attach country names
-    countries_df = load_countries_lookup(country_json_path)
-    merged = results_df.merge(countries_df, on="country_code", how="left")
-    merged = merged.sort_values("AHP_Score", ascending=False)[
-        ["country_code", "country_name", "AHP_Score"]
-    ]
-    return merged
+    # Compute scores as one matrix-vector product; NaN and non-numeric cells
+    # count as 0 and criteria missing from the data contribute nothing
+    cols = [c for c in global_weights if c in df.columns]
+    # The indicators are loaded as float32, so score in float32 as well
+    w = np.fromiter((global_weights[c] for c in cols), dtype=np.float32, count=len(cols))
+    mat = df[cols].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float32)
+    scores = weighted_scores(mat, w)
+
+    # Sort by score (descending) on the arrays, attach names via a dict lookup
+    # and build the result frame once, already in its final column order
+    order = np.argsort(-scores, kind="stable")
+    codes = df["country_code"].array.take(order)
+    name_map = load_country_names(country_json_path)
+    return pd.DataFrame({
+        "country_code": codes,
+        "country_name": [name_map.get(c) for c in codes],
+        "AHP_Score": scores[order],
+    })
+
+# ------------------------------
+# 5) Result sections
+# ------------------------------
+# Keys are continuous slider weights, so bound the cache; reruns within a
+# session reuse the figure from session_state anyway
+@st.cache_data(show_spinner=False, max_entries=16)
+def build_influence_fig(
+    gw_items: Tuple[Tuple[str, float], ...],
+    color_items: Tuple[Tuple[str, str], ...],
+    json_path: str,
+) -> go.Figure:
+    """Horizontal bar chart of each criterion's global weight, colored by pillar."""
+    code_to_label, code_to_pillar = build_code_maps(json_path)
+
+    # Tabular view: sorted by global influence (descending), with the columns
+    # built directly from the sorted arrays
+    codes, vals = zip(*gw_items)
+    vals = np.asarray(vals, dtype=np.float64)
+    order = np.argsort(-vals, kind="stable")
+    codes = [codes[i] for i in order]
+    gw_df = pd.DataFrame({
+        "Criterion": [code_to_label.get(c, c) for c in codes],
+        "Code": codes,
+        "Global Weight": vals[order],
+        "Pillar": [code_to_pillar.get(c, "Other") for c in codes],
+    })
+
+    fig = px.bar(
+        gw_df,
+        x="Global Weight",
+        y="Criterion",
+        color="Pillar",
+        color_discrete_map=dict(color_items),
+        orientation="h",
+        title="Influence of each criterion",
+        labels={"Global Weight": "Influence", "Criterion": "Criterion"},
+        # gw_df is already sorted; px lists the first category on top
+        category_orders={"Criterion": gw_df["Criterion"].tolist()},
+    )
+    fig.update_layout(
+        margin=dict(l=0, r=0, t=30, b=0),
+        height=min(420, 28 * len(gw_df) + 80),
+    )
+    return fig
+
+
+def render_influence_chart(global_weights: Dict[str, float], hierarchy: Dict[str, Any], json_path: str) -> None:
+    """Bar chart of each criterion's global weight, colored by pillar."""
+    st.subheader("AHP Results")
+
+    # Compact horizontal bar chart for quick visual comparison
+    if global_weights:
+        # Color bars by pillar (3 pillars)
+        color_items = tuple(
+            (hierarchy.get(pillar, {}).get("label", default_label), color)
+            for pillar, (default_label, color) in PILLAR_COLORS.items()
+        )
+        # The figure only depends on the weights, so reruns with unchanged
+        # weights reuse this session's figure (or the cached one) instead of
+        # rebuilding it
+        signature = (tuple(global_weights.items()), color_items, json_path)
+        cached = st.session_state.get("influence_bar_fig")
+        if cached is not None and cached[0] == signature:
+            fig = cached[1]
+        else:
+            fig = build_influence_fig(*signature)
+            st.session_state["influence_bar_fig"] = (signature, fig)
+        st.plotly_chart(fig, width='stretch', config={"staticPlot": True}, key="influence_bar")
+
+
+def render_ranking_table(ranking: pd.DataFrame) -> None:
+    """Table of all countries sorted by their total score."""
+    # Prepare display: clear header names and desired column order
+    display_cols = ["country_name", "country_code", "AHP_Score"]
+    if ranking is not None and not ranking.empty:
+        ranking = ranking.loc[:, display_cols]
+    st.markdown("---")
+    st.subheader("Ranking by total score")
+    st.dataframe(
+        ranking,
+        hide_index=True,
+        width='stretch',
+        column_order=display_cols,
+        column_config={
+            "country_name": st.column_config.TextColumn("Country"),
+            "country_code": st.column_config.TextColumn("ISO-3", width="small"),
+            "AHP_Score": st.column_config.NumberColumn("AHP Score", format="%.3f"),
+        },
+    )
+
+
+@st.fragment
+def render_map_section(ranking: pd.DataFrame) -> None:
+    """World map of the country scores.
+
+    A fragment, so switching the map style only reruns this section.
+    """
+    st.markdown("---")
+    st.subheader("World map: Country Scores")
+    use_markers = st.toggle(
+        "Lightweight map",
+        key="map_use_markers",
+        help="Show one marker per country instead of filled country shapes; faster to draw.",
+    )
+    render_world_map(ranking, use_markers=use_markers)
+
 
 # ------------------------------
-# 5) Streamlit app entry
+# 6) Streamlit app entry
 # ------------------------------
 def run_dynamic_ahp(json_path: str, data_path: str, country_json_path: str) -> None:
     st.title("Location Selection Tool")
@@ -242,6 +461,9 @@ def run_dynamic_ahp(json_path: str, data_path: str, country_json_path: str) -> N
     # Trigger zum Öffnen des Kriteriendialogs (nur Button-UI!)
     if st.sidebar.button("Select criteria", key="open_criteria_modal"):
         st.session_state["show_criteria_modal"] = True
+        # Checkboxes start from the applied selection again, so counts stored
+        # for an earlier (e.g. cancelled) edit no longer match them
+        st.session_state["crit_counts_dirty"] = True
 
 
     # --- Criteria selection and filtering ---
@@ -250,7 +472,7 @@ def run_dynamic_ahp(json_path: str, data_path: str, country_json_path: str) -> N
     st.sidebar.markdown("---")
 
     st.sidebar.subheader("Data Overview")
-    df = df.dropna(subset=[c for c in df.columns if c != 'country_code'])
+    df = df.dropna(subset=df.columns.difference(["country_code"]))
     st.sidebar.write(f"Total Countries: {df.shape[0] if df is not None else 0}")
     st.sidebar.write(f"Total Criteria: {len(selected_codes)}")
 
@@ -262,89 +484,19 @@ def run_dynamic_ahp(json_path: str, data_path: str, country_json_path: str) -> N
     # Global weights
     global_weights = compute_global_weights(weights)
 
-
-    # -- AHP Results Criterion Influence --
-
-    st.subheader("AHP Results")
-    # Build mappings from criterion code to label and pillar
-    code_to_label: Dict[str, str] = {}
-    code_to_pillar: Dict[str, str] = {}
-    for sub in hierarchy["top"]["sublevels"]:
-        pillar_label = hierarchy.get(sub, {}).get("label", sub)
-        for crit in hierarchy.get(sub, {}).get("criteria", []):
-            code_to_label[crit["code"]] = crit["label"]
-            code_to_pillar[crit["code"]] = pillar_label
-
-    # Tabular view: sorted by global influence (descending)
-    gw_items = [
-        {
-            "Criterion": code_to_label.get(code, code),
-            "Code": code,
-            "Global Weight": float(w),
-            "Pillar": code_to_pillar.get(code, "Other"),
-        }
-        for code, w in global_weights.items()
-    ]
-    gw_df = pd.DataFrame(gw_items).sort_values("Global Weight", ascending=False).reset_index(drop=True)
-
-    # Compact horizontal bar chart for quick visual comparison
-    if not gw_df.empty:
-        # Color bars by pillar (3 pillars)
-        color_map = {
-            hierarchy.get("environmental", {}).get("label", "Environmental"): "#2a9d8f",
-            hierarchy.get("economic", {}).get("label", "Economic"): "#e9c46a",
-            hierarchy.get("social", {}).get("label", "Social"): "#e76f51",
-        }
-        fig = px.bar(
-            gw_df,
-            x="Global Weight",
-            y="Criterion",
-            color="Pillar",
-            color_discrete_map=color_map,
-            orientation="h",
-            title="Influence of each criterion",
-            labels={"Global Weight": "Influence", "Criterion": "Criterion"},
-        )
-        fig.update_layout(
-            yaxis={"categoryorder": "total ascending"},
-            margin=dict(l=0, r=0, t=30, b=0),
-            height=min(420, 28 * len(gw_df) + 80),
-        )
-        st.plotly_chart(fig, width='stretch', config={"staticPlot": True})
-
-    # --  Ranking Table --
+    # -- AHP Results --
+    render_influence_chart(global_weights, hierarchy, json_path)
     ranking = compute_country_scores(df, global_weights, country_json_path)
-    # Prepare display: clear header names and desired column order
-    display_cols = ["country_name", "country_code", "AHP_Score"]
-    if ranking is not None and not ranking.empty:
-        ranking = ranking.loc[:, display_cols]
-    st.markdown("---")
-    st.subheader("Ranking by total score")
-    st.dataframe(
-        ranking,
-        hide_index=True,
-        width='stretch',
-        column_order=display_cols,
-        column_config={
-            "country_name": st.column_config.TextColumn("Country"),
-            "country_code": st.column_config.TextColumn("ISO-3", width="small"),
-            "AHP_Score": st.column_config.NumberColumn("AHP Score", format="%.3f"),
-        },
-    )
-
-    # --  World Map --
-
-    st.markdown("---")
-    st.subheader("World map: Country Scores")
-    render_world_map(ranking)
+    render_ranking_table(ranking)
+    render_map_section(ranking)
 
 
 # ------------------------------
-# 6) Script entrypoint
+# 7) Script entrypoint
 # ------------------------------
 if __name__ == "__main__":
     # Note: Labels for categories and criteria come from the JSON file
     json_path = "ahp_criteria_structure_v4.json"  # hierarchy JSON
-    data_path = "combined_wide_CLEAN.xlsx"  # country indicators
+    data_path = "combined_wide_CLEAN.xlsx"  # country indicators (read via its Parquet copy)
     country_json_path = "country_codes_names.json"  # ISO-3 --> country name mapping
     run_dynamic_ahp(json_path, data_path, country_json_path)
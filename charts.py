@@ -1,24 +1,43 @@
+from typing import Optional
+
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 import streamlit as st
 
-def plot_horizontal_stacked(df: pd.DataFrame, label_col: str, value_col: str, title: str) -> None:
+# Shared chart styling, defined once at import
+_PALETTE = ("#74c69d", "#4ea8de", "#f6bd60", "#f28482", "#9d4edd", "#00b4d8", "#6c757d")
+_TIGHT_MARGIN = dict(l=0, r=0, t=30, b=0)
+_MAP_MARGIN = dict(l=0, r=0, t=0, b=0)
+
+def plot_horizontal_stacked(
+    df: pd.DataFrame, label_col: str, value_col: str, title: str, key: Optional[str] = None
+) -> None:
     """Renders a compact horizontal stacked bar chart using Plotly."""
+    # Zero-width segments are invisible; skip them (and the chart if nothing is left)
+    df = df[df[value_col] > 0]
+    if df.empty:
+        return
+
     fig = go.Figure()
-    colors = ["#74c69d", "#4ea8de", "#f6bd60", "#f28482", "#9d4edd", "#00b4d8", "#6c757d"]
-
-    for i, row in df.iterrows():
-        fig.add_trace(
-            go.Bar(
-                y=["Weight"],
-                x=[row[value_col]],
-                orientation="h",
-                name=str(row[label_col]),
-                marker_color=colors[i % len(colors)],
-                text=f"{row[label_col]}<br>{row[value_col]*100:.1f}%",
-                hoverinfo="text",
-            )
+
+    # Stacking needs one trace per segment (one legend entry each), but names,
+    # texts and colors are prepared column-wise up front
+    labels = df[label_col].astype(str).to_numpy(dtype=str)
+    values = df[value_col].to_numpy(dtype=float)
+    texts = np.char.add(np.char.add(labels, "<br>"), np.char.mod("%.1f%%", values * 100)).tolist()
+    marker_colors = [_PALETTE[i % len(_PALETTE)] for i in range(len(labels))]
+
+    for label, value, text, color in zip(labels.tolist(), values.tolist(), texts, marker_colors):
+        fig.add_bar(
+            y=["Weight"],
+            x=[value],
+            orientation="h",
+            name=label,
+            marker_color=color,
+            text=text,
+            hoverinfo="text",
         )
 
     fig.update_layout(
@@ -26,33 +45,32 @@ def plot_horizontal_stacked(df: pd.DataFrame, label_col: str, value_col: str, ti
         title=title,
         showlegend=True,
         height=100,
-        margin=dict(l=0, r=0, t=30, b=0),
+        margin=_TIGHT_MARGIN,
         xaxis=dict(range=[0, 1], showticklabels=False),
         yaxis=dict(showticklabels=False),
     )
-    st.plotly_chart(fig, width='stretch',  config={"staticPlot": True})
+    st.plotly_chart(fig, width='stretch', config={"staticPlot": True}, key=key)
 
 
-def plot_pie(df: pd.DataFrame, label_col: str, value_col: str, title: str) -> None:
-    labels = df[label_col].tolist()
-    values = df[value_col].tolist()
+def _build_pie(labels: tuple, values: tuple, title: str) -> go.Figure:
+    """Build the pie figure for the given slice labels and values."""
+    labels = np.asarray(labels, dtype=str)
+    vals = np.asarray(values, dtype=float)
 
-    custom_text = [
-        f"{l}: {v*100:.1f}%" if v > 0 else ""
-        for l, v in zip(labels, values)
-    ]
+    # "<label>: <share>%" for each non-empty slice, formatted once in one
+    # vectorized pass, so Plotly only displays the prepared text
+    total = vals.sum()
+    pct = np.char.mod("%.1f%%", (vals / total if total > 0 else vals) * 100)
+    custom_text = np.where(vals > 0, np.char.add(np.char.add(labels, ": "), pct), "").tolist()
 
     fig = go.Figure(go.Pie(
-        labels=labels,
-        values=values,
+        labels=labels.tolist(),
+        values=list(values),
         text=custom_text,
         textinfo="text",
         textposition="outside",
         hoverinfo="skip",
-        marker_colors=[
-            "#74c69d", "#4ea8de", "#f6bd60",
-            "#f28482", "#9d4edd", "#00b4d8", "#6c757d"
-        ]
+        marker_colors=_PALETTE,
     ))
 
     fig.update_layout(
@@ -61,31 +79,32 @@ def plot_pie(df: pd.DataFrame, label_col: str, value_col: str, title: str) -> No
         margin=dict(t=60, b=40),
         showlegend=True,
     )
+    return fig
 
-    st.plotly_chart(fig, width='stretch', config={"displayModeBar": False})
 
+def plot_pie(
+    df: pd.DataFrame, label_col: str, value_col: str, title: str, key: Optional[str] = None
+) -> None:
+    labels = tuple(df[label_col].astype(str))
+    values = tuple(df[value_col].to_numpy(dtype=float).tolist())
 
-def render_world_map(ranking_df: pd.DataFrame) -> None:
-    """Display a Plotly choropleth world map for AHP scores.
+    # With a key, the figure is kept in session_state and only rebuilt when
+    # the slices change
+    signature = (labels, values, title)
+    fig_key = f"{key}_fig"
+    cached = st.session_state.get(fig_key) if key else None
+    if cached is not None and cached[0] == signature:
+        fig = cached[1]
+    else:
+        fig = _build_pie(labels, values, title)
+        if key:
+            st.session_state[fig_key] = (signature, fig)
 
-    Expects columns: 'country_name', country_code' (ISO-3)', 'AHP_Score'.
-    """
-    if ranking_df is None or ranking_df.empty:
-        st.info("No data available for the map.")
-        return
+    st.plotly_chart(fig, width='stretch', config={"displayModeBar": False}, key=key)
 
-    fig = px.choropleth(
-        ranking_df.round({"AHP_Score":3}),
-        locations="country_code",
-        locationmode="ISO-3",
-        color="AHP_Score",
-        hover_name="country_name",
-        color_continuous_scale="Viridis",
-        projection="natural earth",
-        labels={"AHP_Score": "AHP Score",
-                "country_code": "ISO-3"},
-    )
 
+def _style_world_map(fig: go.Figure) -> go.Figure:
+    """Apply the shared geo styling and layout of the world map."""
     fig.update_geos(
         showcountries=True,
         countrycolor="white",
@@ -95,8 +114,91 @@ def render_world_map(ranking_df: pd.DataFrame) -> None:
         landcolor="#F5F5F5",
     )
     fig.update_layout(
-        margin=dict(l=0, r=0, t=0, b=0),
+        margin=_MAP_MARGIN,
         coloraxis_colorbar=dict(title="AHP Score"),
     )
+    return fig
+
+
+def _build_choropleth(records: tuple) -> go.Figure:
+    """Build the world map figure from (country_code, country_name, AHP_Score) rows."""
+    map_df = pd.DataFrame(records, columns=["country_code", "country_name", "AHP_Score"])
+    fig = px.choropleth(
+        map_df,
+        locations="country_code",
+        locationmode="ISO-3",
+        color="AHP_Score",
+        hover_name="country_name",
+        color_continuous_scale="Viridis",
+        projection="natural earth",
+        labels={"AHP_Score": "AHP Score",
+                "country_code": "ISO-3"},
+    )
+    fig.update_traces(marker_line_width=0)
+    return _style_world_map(fig)
+
+
+def _build_marker_map(records: tuple) -> go.Figure:
+    """Lightweight world map: one marker per country instead of filled polygons."""
+    map_df = pd.DataFrame(records, columns=["country_code", "country_name", "AHP_Score"])
+    fig = go.Figure(go.Scattergeo(
+        locations=map_df["country_code"],
+        locationmode="ISO-3",
+        marker=dict(
+            color=map_df["AHP_Score"],
+            coloraxis="coloraxis",
+            size=10,
+        ),
+        hovertext=map_df["country_name"],
+        customdata=map_df["AHP_Score"],
+        hovertemplate="<b>%{hovertext}</b><br>AHP Score=%{customdata}<extra></extra>",
+    ))
+    fig.update_layout(coloraxis=dict(colorscale="Viridis"))
+    fig.update_geos(projection_type="natural earth")
+    return _style_world_map(fig)
+
+
+def _update_world_map(fig: go.Figure, records: tuple, use_markers: bool) -> None:
+    """Swap the per-country data of an existing world map figure in place."""
+    codes, names, scores = zip(*records)
+    scores = np.asarray(scores, dtype=float)
+    trace = fig.data[0]
+    trace.locations = codes
+    trace.hovertext = names
+    if use_markers:
+        trace.marker.color = scores
+        trace.customdata = scores
+    else:
+        trace.z = scores
+
+
+def render_world_map(ranking_df: pd.DataFrame, use_markers: bool = False) -> None:
+    """Display a Plotly world map for AHP scores.
+
+    Expects columns: 'country_name', country_code' (ISO-3)', 'AHP_Score'.
+    Draws a choropleth by default; with use_markers=True a scattergeo marker
+    map is drawn instead, which is much cheaper to render in the browser.
+    The figure is built once per session and only its data is updated later.
+    """
+    if ranking_df is None or ranking_df.empty:
+        st.info("No data available for the map.")
+        return
+
+    # Hashable snapshot of the ranking to detect whether the map data changed
+    records = tuple(
+        ranking_df.loc[:, ["country_code", "country_name", "AHP_Score"]]
+        .round({"AHP_Score": 3})
+        .itertuples(index=False, name=None)
+    )
+
+    fig_key = "world_map_markers_fig" if use_markers else "world_map_fig"
+    records_key = f"{fig_key}_records"
+    fig = st.session_state.get(fig_key)
+    if fig is None:
+        fig = _build_marker_map(records) if use_markers else _build_choropleth(records)
+        st.session_state[fig_key] = fig
+    elif st.session_state.get(records_key) != records:
+        _update_world_map(fig, records, use_markers)
+    st.session_state[records_key] = records
 
-    st.plotly_chart(fig, width='stretch')
\ No newline at end of file
+    st.plotly_chart(fig, width='stretch', key="world_map")
\ No newline at end of file
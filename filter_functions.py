@@ -1,15 +1,24 @@
-from typing import List, Tuple, Dict, Any, Set
+import functools
+import itertools
+from typing import List, Tuple, Dict, Any, FrozenSet
+import numpy as np
 import streamlit as st
 import pandas as pd
 
 
 def format_criterion_help(criterion: Dict[str, Any]) -> str:
     # Formats the help text for a given criterion.
-    label = criterion.get("label", criterion.get("code", ""))
-    description = criterion.get("description", "No description available.")
-    year = criterion.get("year")
-    source = criterion.get("source_short")
+    return _format_help_cached(
+        criterion.get("label", criterion.get("code", "")),
+        criterion.get("description", "No description available."),
+        criterion.get("year"),
+        criterion.get("source_short"),
+    )
 
+
+@functools.lru_cache(maxsize=None)
+def _format_help_cached(label: str, description: str, year: Any, source: Any) -> str:
+    # Criteria are static, so each help text is only built once per process.
     lines = [
         f"**Criterion**: {label}",
         f"**Description**: {description}",
@@ -22,12 +31,68 @@ def format_criterion_help(criterion: Dict[str, Any]) -> str:
     return "  \n".join(lines)
 
 
+@st.cache_data(show_spinner=False)
+def _build_valid_rows(df_raw: pd.DataFrame) -> Dict[str, FrozenSet[str]]:
+    """Map each criterion code to the countries that have a value for it."""
+    # One columnar notna pass over all criteria instead of one filter per column
+    codes = [c for c in df_raw.columns if c != "country_code"]
+    mask = df_raw.set_index("country_code")[codes].notna()
+    return {code: frozenset(mask.index[mask[code].to_numpy()]) for code in mask.columns}
+
+
+@st.cache_data(show_spinner=False)
+def _build_country_bitmasks(
+    df_raw: pd.DataFrame,
+) -> Tuple[Dict[str, np.ndarray], Dict[str, int], np.ndarray]:
+    """Encode each criterion's valid countries as a uint64 bitmask.
+
+    Bits follow the sorted order of all country codes. Returns the per-code
+    masks, the number of countries in each mask and the mask of all countries.
+    """
+    code_to_valid_rows = _build_valid_rows(df_raw)
+    country_index = {c: i for i, c in enumerate(sorted(set(df_raw["country_code"])))}
+    n_bits = max(64, -(-len(country_index) // 64) * 64)
+
+    def _pack(countries) -> np.ndarray:
+        bits = np.zeros(n_bits, dtype=bool)
+        bits[[country_index[c] for c in countries]] = True
+        return np.packbits(bits, bitorder="little").view(np.uint64)
+
+    code_to_bitmask = {code: _pack(rows) for code, rows in code_to_valid_rows.items()}
+    code_to_count = {code: len(rows) for code, rows in code_to_valid_rows.items()}
+    return code_to_bitmask, code_to_count, _pack(country_index)
+
+
+def _popcount(bitmask: np.ndarray) -> int:
+    """Number of set bits in a uint64 bitmask."""
+    return int(np.unpackbits(bitmask.view(np.uint8)).sum())
+
+
+def _intersect_masks(
+    codes: List[str],
+    code_to_bitmask: Dict[str, np.ndarray],
+    code_to_count: Dict[str, int],
+    full_mask: np.ndarray,
+) -> np.ndarray:
+    """AND the codes' bitmasks together, smallest first, stopping once no country is left."""
+    acc = full_mask
+    for code in sorted(codes, key=code_to_count.__getitem__):
+        acc = acc & code_to_bitmask[code]
+        if not acc.any():
+            break
+    return acc
+
+
+def _mark_counts_dirty() -> None:
+    # Checkbox callback: the stored country counts no longer match the selection.
+    st.session_state["crit_counts_dirty"] = True
+
 
 def select_and_filter_criteria(
     df_raw: pd.DataFrame,
     hierarchy: Dict[str, Any]
 ) -> Tuple[List[str], pd.DataFrame]:
-    available_codes = set(df_raw.columns) - {"country_code"}
+    available_codes = frozenset(df_raw.columns) - {"country_code"}
     pillars = hierarchy.get("top", {}).get("sublevels", [])
     pillar_to_criteria = {
         p: [c for c in hierarchy.get(p, {}).get("criteria", []) if c.get("code") in available_codes]
@@ -37,15 +102,13 @@ def select_and_filter_criteria(
     default_selection = {
         c["code"]: True for plist in pillar_to_criteria.values() for c in plist
     }
+    # Checkbox widget keys, formatted once per run
+    sel_keys = {code: f"sel_{code}" for code in default_selection}
 
     if "selected_criteria" not in st.session_state:
         st.session_state["selected_criteria"] = default_selection.copy()
 
-    code_to_valid_rows: Dict[str, Set[str]] = {
-        code: set(df_raw[df_raw[code].notna()]["country_code"])
-        for code in available_codes
-    }
-    all_countries = set(df_raw["country_code"])
+    code_to_bitmask, code_to_count, all_countries_mask = _build_country_bitmasks(df_raw)
 
     if "show_criteria_modal" not in st.session_state:
         st.session_state["show_criteria_modal"] = False
@@ -54,20 +117,39 @@ def select_and_filter_criteria(
 
     @st.dialog("Select criteria")
     def _criteria_dialog() -> None:
-        st.caption("Choose which criteria to include. The count (n=...) shows how many countries remain if selected.")
+        st.caption(
+            "Choose which criteria to include. Use 'Preview counts' (or turn on live counts) "
+            "to see how many countries (n=...) remain if a criterion is selected."
+        )
 
-        col_sel_a, col_sel_b = st.columns(2)
+        col_sel_a, col_sel_b, col_preview = st.columns(3)
         if col_sel_a.button("Select All", key="crit_select_all"):
-            for code in default_selection:
-                st.session_state[f"sel_{code}"] = True
+            st.session_state.update(dict.fromkeys(sel_keys.values(), True))
+            _mark_counts_dirty()
         if col_sel_b.button("Deselect All", key="crit_deselect_all"):
-            for code in default_selection:
-                st.session_state[f"sel_{code}"] = False
-
-        current_selected = {
-            code for code in default_selection
-            if st.session_state.get(f"sel_{code}", st.session_state["selected_criteria"].get(code, True))
-        }
+            st.session_state.update(dict.fromkeys(sel_keys.values(), False))
+            _mark_counts_dirty()
+        preview = col_preview.button("Preview counts", key="crit_preview_counts")
+        live = st.toggle("Live counts", key="crit_live_counts")
+
+        # Counts are only recomputed on request (or per change in live mode)
+        if (live or preview) and st.session_state.get("crit_counts_dirty", True):
+            current_selected = {
+                code for code in default_selection
+                if st.session_state.get(sel_keys[code], st.session_state["selected_criteria"].get(code, True))
+            }
+            # Countries left by the current selection; each row only adds its own mask
+            base_mask = _intersect_masks(
+                [c for c in current_selected if c in code_to_bitmask],
+                code_to_bitmask,
+                code_to_count,
+                all_countries_mask,
+            )
+            st.session_state["crit_counts"] = {
+                code: _popcount(base_mask & code_to_bitmask[code]) for code in default_selection
+            }
+            st.session_state["crit_counts_dirty"] = False
+        counts = None if st.session_state.get("crit_counts_dirty", True) else st.session_state.get("crit_counts")
 
         for pillar in pillars:
             criteria = pillar_to_criteria.get(pillar, [])
@@ -81,19 +163,15 @@ def select_and_filter_criteria(
                 #desc = criterion.get("description", "") or label
                 desc = format_criterion_help(criterion)
 
-                combined = current_selected | {code}
-                valid_sets = [code_to_valid_rows[c] for c in combined if c in code_to_valid_rows]
-                valid_countries = set.intersection(*valid_sets) if valid_sets else all_countries
-                country_count = len(valid_countries)
-
-                code_key = f"sel_{code}"
+                code_key = sel_keys[code]
                 if code_key not in st.session_state:
                     st.session_state[code_key] = st.session_state["selected_criteria"].get(code, True)
 
                 st.checkbox(
-                    f"{label} (n={country_count})",
+                    f"{label} (n={counts[code]})" if counts else label,
                     key=code_key,
                     help=desc,
+                    on_change=_mark_counts_dirty,
                 )
 
         col_apply, col_cancel = st.columns([1, 1])
@@ -104,7 +182,7 @@ def select_and_filter_criteria(
                 criteria_codes = [c["code"] for c in pillar_to_criteria.get(pillar, [])]
                 selected_in_pillar = [
                     code for code in criteria_codes 
-                    if st.session_state.get(f"sel_{code}", False)
+                    if st.session_state.get(sel_keys[code], False)
                 ]
                 if not selected_in_pillar:
                     missing_pillars.append(hierarchy.get(pillar, {}).get("label", pillar))
@@ -117,8 +195,9 @@ def select_and_filter_criteria(
                 st.stop()  # Prevent Apply and rerun
             else:
                 # --- Valid selection: Commit it ---
-                for code in default_selection:
-                    st.session_state["selected_criteria"][code] = st.session_state.get(f"sel_{code}", False)
+                st.session_state["selected_criteria"].update(
+                    {code: st.session_state.get(key, False) for code, key in sel_keys.items()}
+                )
                 st.session_state["show_criteria_modal"] = False
                 st.rerun()
 
@@ -129,16 +208,19 @@ def select_and_filter_criteria(
     if st.session_state["show_criteria_modal"]:
         _criteria_dialog()
 
-    selected_codes = [
-        code for code, on in st.session_state["selected_criteria"].items()
-        if on and code in available_codes
-    ]
+    # default_selection only holds available codes, so no membership check is needed
+    selected = st.session_state["selected_criteria"]
+    selected_codes = list(itertools.compress(
+        default_selection, [selected.get(code, False) for code in default_selection]
+    ))
 
     if not selected_codes and available_codes:
         selected_codes = sorted(list(available_codes))
 
+    # selected_codes come from available_codes, so every column exists; the
+    # projection and dropna both return new frames, no defensive copy needed
     keep_cols = ["country_code"] + selected_codes
-    df_filtered = df_raw.loc[:, [c for c in keep_cols if c in df_raw.columns]].copy()
+    df_filtered = df_raw.loc[:, keep_cols]
 
     if selected_codes:
         df_filtered = df_filtered.dropna(subset=selected_codes)
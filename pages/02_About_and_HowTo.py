@@ -28,7 +28,9 @@ These values are normalized so they always sum to 1.
 
 **3. Weight the Indicators inside Each Category**  
 Every criterion within a category can be weighted individually.  
-Each category also normalizes automatically to keep the sum at 1.
+Each category also normalizes automatically to keep the sum at 1.  
+Slider changes are collected first; click *“Apply weights”* to apply all of them at once and
+refresh the charts, ranking and world map.
 
 **4. Review the Global Influence of Each Criterion**  
 The tool multiplies pillar weights with indicator weights to compute global weights.
@@ -15,8 +15,15 @@ st.markdown("---")
 # ----------------------------
 JSON_PATH = "ahp_criteria_structure_v4.json"
 
-with open(JSON_PATH, "r", encoding="utf-8") as f:
-    hierarchy = json.load(f)
+
+@st.cache_resource(show_spinner=False)
+def _load_hierarchy(path: str) -> dict:
+    """Parse the hierarchy JSON once and share it across reruns (read-only)."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+hierarchy = _load_hierarchy(JSON_PATH)
 
 
 top = hierarchy.get("top", {})
@@ -26,24 +33,23 @@ for pillar_id in sublevels:
     pillar = hierarchy.get(pillar_id, {})
     pillar_label = pillar.get("label", pillar_id)
 
-    st.header(pillar_label)
-
     criteria = pillar.get("criteria", [])
     if not criteria:
+        st.header(pillar_label)
         st.info("No indicators found for this category.")
         continue
 
+    # Render the whole category as one markdown element instead of several per indicator
+    chunks = [f"## {pillar_label}"]
     for crit in criteria:
-        st.subheader(crit.get("label", "Unnamed Indicator"))
-
-        st.markdown(f"""
-        **Description:**  
-        {crit.get("description", "No description available.")}
-
-        **Year:** {crit.get("year", "n/a")}  
-        **Source (short):** {crit.get("source_short", "n/a")}  
-        **Source (full):** {crit.get("source_long", "n/a")}  
-        """)
-
-
-        st.markdown("---")
+        chunks.append(
+            f"### {crit.get('label', 'Unnamed Indicator')}\n\n"
+            f"**Description:**  \n"
+            f"{crit.get('description', 'No description available.')}\n\n"
+            f"**Year:** {crit.get('year', 'n/a')}  \n"
+            f"**Source (short):** {crit.get('source_short', 'n/a')}  \n"
+            f"**Source (full):** {crit.get('source_long', 'n/a')}\n\n"
+            f"---\n"
+        )
+
+    st.markdown("\n".join(chunks))
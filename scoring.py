@@ -0,0 +1,48 @@
+import numpy as np
+
+try:  # optional: compiled scoring kernel for large indicator tables
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+# Once loaded, the kernel beats nan_to_num + matmul at any size, but the first
+# call per process costs ~150 ms (loading the cached machine code; compiling
+# takes seconds). From about a million cells each run saves several ms, so
+# the one-time load pays for itself within a session.
+NUMBA_MIN_CELLS = 1_000_000
+
+# Defined here rather than in the Streamlit script, which is re-executed on
+# every rerun: a module keeps one numba dispatcher for the whole process
+if njit is not None:
+    # fastmath without "nnan", so the inline NaN check is not optimized away
+    @njit(cache=True, parallel=True, fastmath={"nsz", "arcp", "contract", "afn", "reassoc"})
+    def _score_kernel(mat: np.ndarray, w: np.ndarray) -> np.ndarray:
+        # Rows are split into blocks across threads; within a block the
+        # columns are walked one at a time, which reads a column-major
+        # (Fortran-ordered) matrix sequentially
+        n, k = mat.shape
+        block = 4096
+        out = np.empty(n, dtype=np.float32)
+        for b in prange((n + block - 1) // block):
+            lo = b * block
+            hi = min(lo + block, n)
+            acc = np.zeros(hi - lo)
+            for j in range(k):
+                wj = w[j]
+                for i in range(lo, hi):
+                    v = mat[i, j]
+                    if v == v:  # NaN cells count as 0
+                        acc[i - lo] += v * wj
+            out[lo:hi] = acc
+        return out
+else:
+    _score_kernel = None
+
+
+def weighted_scores(mat: np.ndarray, w: np.ndarray) -> np.ndarray:
+    """Row-wise weighted sum of a float32 matrix; NaN cells count as 0."""
+    if _score_kernel is not None and mat.size >= NUMBA_MIN_CELLS:
+        # DataFrame.to_numpy() of a numeric frame is already column-major, so
+        # this is normally a no-op rather than a copy
+        return _score_kernel(np.asfortranarray(mat), w)
+    return np.nan_to_num(mat) @ w